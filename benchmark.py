@@ -0,0 +1,286 @@
+import io
+import os
+import sys
+import gc
+import json
+import time
+import timeit
+import random
+from functools import partial
+import itertools
+import zipfile
+import argparse
+import platform
+import tempfile
+import tracemalloc
+from webDataParser import (
+    unpack_zip, unpack_zip_members, iter_zip_text, extract_sections, extract_sections_stream, parse_table, number_value,
+    search, search_tables, search_sections, lookup_column, lookup_row, lookup_cell,
+)
+from reportstore import dump_report, load_report, load_section
+
+'''
+Synthetic DART document generator
+'''
+WORDS = [
+    "공모", "증권", "인수인", "청약", "납입", "기관투자자", "희망공모가액", "주식", "발행", "회사",
+    "위험", "희석", "상장", "예정", "보호예수", "매출", "신주", "배정", "일반투자자", "우리사주조합",
+]
+SECTION_TITLES = ["공모개요", "공모방법", "공모가격결정방법", "기타위험", "인수등에관한사항", "투자위험요소"]
+HEADERS = ["구분", "증권수량", "인수인", "인수금액", "청약기일", "납입기일", "비고"]
+
+# (sections, paragraphs per section, tables per section, rows per table, cols per table)
+SIZES = {
+    "small": (4, 5, 2, 8, 5),
+    "medium": (12, 15, 4, 20, 7),
+    "large": (40, 30, 8, 40, 9),
+}
+
+def make_sentence(rng: random.Random):
+    return " ".join(rng.choice(WORDS) for _ in range(rng.randint(4, 12))) + "."
+
+def make_table(rng: random.Random, rows: int, cols: int, span_density: float=0.1):
+    '''
+    Build a <TABLE> block. span_density is the probability that a body cell gets a colspan/rowspan.
+    '''
+    lines = ['<TABLE BORDER="1">', "<TR>" + "".join(f"<TH>{HEADERS[c % len(HEADERS)]}</TH>" for c in range(cols)) + "</TR>"]
+    covered = set() # (row, col) positions taken by earlier rowspans
+    for r in range(1, rows):
+        cells, c = [], 0
+        while c < cols:
+            if (r, c) in covered:
+                c += 1
+                continue
+            if c == 0: text = f"{rng.choice(WORDS)}{r}"
+            elif rng.random() < 0.5: text = f"{rng.randint(1, 10**9):,}"
+            else: text = f"{2025}년 {rng.randint(1, 12)}월 {rng.randint(1, 28)}일"
+            attrs = ""
+            if c > 0 and rng.random() < span_density:
+                colspan = min(rng.randint(1, 3), cols - c)
+                rowspan = min(rng.randint(1, 3), rows - r)
+                if colspan > 1: attrs += f' COLSPAN="{colspan}"'
+                if rowspan > 1: attrs += f' ROWSPAN="{rowspan}"'
+                for dr in range(1, rowspan):
+                    for dc in range(colspan): covered.add((r + dr, c + dc))
+                c += colspan
+            else: c += 1
+            cells.append(f'<TD{attrs}><P>{text}</P></TD>')
+        lines.append("<TR>" + "".join(cells) + "</TR>")
+    lines.append("</TABLE>")
+    return "\n".join(lines)
+
+def make_document(sections: int=4, paragraphs: int=5, tables: int=2, rows: int=8, cols: int=5, span_density: float=0.1, seed: int=0):
+    '''
+    Build a synthetic DART-style XML document.
+    '''
+    rng = random.Random(seed)
+    parts = ['<?xml version="1.0" encoding="utf-8"?>', "<DOCUMENT>", "<BODY>"]
+    for s in range(sections):
+        parts.append(f"<SECTION-1><TITLE ATOC=\"Y\">{s + 1}. {SECTION_TITLES[s % len(SECTION_TITLES)]}</TITLE>")
+        for p in range(paragraphs):
+            parts.append("<P>" + " ".join(make_sentence(rng) for _ in range(rng.randint(1, 4))) + "</P>\n")
+            if p < tables: parts.append(make_table(rng, rows, cols, span_density))
+        parts.append("</SECTION-1>")
+    parts.extend(["</BODY>", "</DOCUMENT>"])
+    return "\n".join(parts)
+
+def make_zip(text: str, encoding: str="utf-8"):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as zf: zf.writestr("document.xml", text.encode(encoding))
+    return buffer.getvalue()
+
+
+'''
+Measurement
+'''
+def measure(cases: dict, repeat: int=15, min_time: float=0.02):
+    '''
+    Time each zero-argument callable in `cases` like timeit, with the garbage collector disabled: one warmup call,
+    then `repeat` rounds of as many calls as fit in `min_time` seconds. Rounds go round-robin over the cases,
+    so a slow stretch on a busy machine hits one round of every case rather than every round of one.
+    Returns per-call timings (seconds) and peak traced memory (bytes) of one extra run for each case.
+    '''
+    timers, numbers, timings = {}, {}, {name: [] for name in cases}
+    for name, func in cases.items():
+        timer = timers[name] = timeit.Timer(func)
+        timer.timeit(1) # warmup
+        number = 1
+        while timer.timeit(number) < min_time: number *= 2 # like Timer.autorange, with a configurable target
+        numbers[name] = number
+    for _ in range(repeat):
+        for name, timer in timers.items(): timings[name].append(timer.timeit(numbers[name]) / numbers[name])
+
+    results = {}
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for name, func in cases.items():
+            tracemalloc.start()
+            try:
+                func()
+                _, peak = tracemalloc.get_traced_memory()
+            finally: tracemalloc.stop()
+            timing = sorted(timings[name])
+            results[name] = {
+                "min": timing[0],
+                "median": timing[len(timing) // 2],
+                "max": timing[-1],
+                "peak_memory": peak,
+                "repeat": repeat,
+                "number": numbers[name],
+            }
+    finally:
+        if gc_enabled: gc.enable()
+    return results
+
+def reference_workload():
+    '''
+    Fixed pure-Python work timed alongside the real cases. compare() scales the baseline by how much slower
+    this ran, so a machine that is busier overall than when the baseline was taken doesn't count as a regression.
+    '''
+    words = {}
+    for i in range(2000):
+        key = f"{WORDS[i % len(WORDS)]}{i % 97}"
+        words[key] = words.get(key, 0) + len(key.split("_"))
+    return sorted(words.items())
+
+def write_workbook(path: str, tables: list):
+    from excelwriter import ExcelFile
+    excel = ExcelFile(path)
+    for i, table in enumerate(tables):
+        sheet = f"T{i}"
+        excel.clear_sheet(sheet)
+        excel.write_table_list(sheet, (1, 1), table)
+    excel.save()
+
+def bench_size(name: str, spec: tuple, span_density: float, repeat: int, min_time: float=0.02):
+    '''
+    Benchmark every hot path against one synthetic document size.
+    '''
+    text = make_document(*spec, span_density=span_density)
+    zipped = make_zip(text)
+    zipped_cp949 = make_zip(text, "cp949")
+    sections = extract_sections(text)
+    tables = [table for section in sections.values() for table in section["tables"]]
+    table_html = make_table(random.Random(1), spec[3], spec[4], span_density)
+    table = parse_table(table_html)
+    numbers = [cell for row in table[1:] for cell in row[1:] if cell.replace(",", "").isdigit()]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path, binary_path = os.path.join(tmp, "report.json"), os.path.join(tmp, "report.dart")
+        with open(json_path, "w", encoding="utf-8") as f: json.dump(sections, f, ensure_ascii=False, indent=2)
+        dump_report(sections, binary_path)
+        title = next(iter(sections))
+        def load_json():
+            with open(json_path, "r", encoding="utf-8") as f: return json.load(f)
+
+        cases = {
+            "reference": reference_workload,
+            "unpack_zip": partial(unpack_zip, zipped),
+            "unpack_zip_cp949": partial(unpack_zip, zipped_cp949),
+            "unpack_zip_members": partial(unpack_zip_members, zipped),
+            "extract_sections": partial(extract_sections, text),
+            "extract_sections_stream": lambda: extract_sections_stream(iter_zip_text(zipped)),
+            "parse_table": partial(parse_table, table_html),
+            "search": partial(search, sections, include_keywords="희석"),
+            "search_tables": partial(search_tables, list(sections.values()), parent_count=2, include_keywords="인수인"),
+            "search_sections": partial(search_sections, sections, "공모"),
+            "lookup_column": lambda: [lookup_column(t, "인수금액") for t in tables],
+            "lookup_row": lambda: [lookup_row(t, "공모") for t in tables],
+            "lookup_cell": lambda: [lookup_cell(t, "공모", "증권수량") for t in tables],
+            "number_value": partial(number_value, numbers, 8, unit="억"),
+            "report_dump_binary": partial(dump_report, sections, os.path.join(tmp, "dump.dart")),
+            "report_load_json": load_json,
+            "report_load_binary": partial(load_report, binary_path, lazy=False),
+            "report_load_section": partial(load_section, binary_path, title),
+            # warm get_report path as main.py uses it: load, then pick sections by name
+            "report_search_json": lambda: search_sections(load_json(), "공모개요"),
+            "report_search_lazy": lambda: search_sections(load_report(binary_path, lazy=True), "공모개요"),
+        }
+        try:
+            import openpyxl # noqa: F401
+        except ImportError:
+            print("  openpyxl not installed, skipping ExcelFile benchmarks", file=sys.stderr)
+        else:
+            counter = itertools.count()
+            cases["excel_write_save"] = lambda: write_workbook(os.path.join(tmp, f"bench_{next(counter)}.xlsx"), tables)
+        results = measure(cases, repeat, min_time)
+        reference = results.pop("reference")
+
+    return {
+        "document": {
+            "sections": spec[0], "paragraphs": spec[1], "tables": spec[2], "rows": spec[3], "cols": spec[4],
+            "span_density": span_density, "text_chars": len(text), "zip_bytes": len(zipped), "cells": sum(len(r) for t in tables for r in t),
+        },
+        "reference": reference["min"],
+        "results": results,
+    }
+
+
+'''
+Baseline comparison
+'''
+def compare(current: dict, baseline: dict, threshold: float=0.2, time_floor: float=20e-6, memory_floor: int=64 * 1024):
+    '''
+    Return a list of regressions where the best (min) time or peak memory grew by more than `threshold` (ratio)
+    and by more than an absolute noise floor (`time_floor` seconds, `memory_floor` bytes).
+    Baseline times are first scaled by the reference workload's slowdown between the two runs.
+    '''
+    regressions = []
+    for size, entry in current["sizes"].items():
+        base_entry = baseline.get("sizes", {}).get(size)
+        if not base_entry: continue
+        scale = entry["reference"] / base_entry["reference"] if base_entry.get("reference") and entry.get("reference") else 1.0
+        for bench, stats in entry["results"].items():
+            base_stats = base_entry["results"].get(bench)
+            if not base_stats: continue
+            for metric, floor, factor in (("min", time_floor, scale), ("peak_memory", memory_floor, 1.0)):
+                before, after = base_stats[metric] * factor, stats[metric]
+                if before and after > before * (1 + threshold) and after - before > floor:
+                    regressions.append({
+                        "size": size, "benchmark": bench, "metric": metric,
+                        "baseline": base_stats[metric], "current": after,
+                        "ratio": after / before,
+                    })
+    return regressions
+
+def run(sizes: list, span_density: float=0.1, repeat: int=15, min_time: float=0.02):
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "sizes": {},
+    }
+    for size in sizes:
+        print(f"Benchmarking {size}...", file=sys.stderr)
+        report["sizes"][size] = bench_size(size, SIZES[size], span_density, repeat, min_time)
+    return report
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Offline benchmarks for parser, search and writer hot paths.")
+    parser.add_argument("--sizes", nargs="+", default=list(SIZES), choices=list(SIZES))
+    parser.add_argument("--span-density", type=float, default=0.1)
+    parser.add_argument("--repeat", type=int, default=15, help="timing rounds per benchmark")
+    parser.add_argument("--min-time", type=float, default=0.02, help="minimum seconds per timing round")
+    parser.add_argument("--output", default="", help="write JSON results to this file (stdout if empty)")
+    parser.add_argument("--baseline", default="", help="JSON results to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed slowdown ratio before failing")
+    parser.add_argument("--time-floor", type=float, default=20e-6, help="ignore slowdowns smaller than this many seconds per call")
+    parser.add_argument("--memory-floor", type=int, default=64 * 1024, help="ignore peak memory growth smaller than this many bytes")
+    args = parser.parse_args(argv)
+
+    report = run(args.sizes, args.span_density, args.repeat, args.min_time)
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f: baseline = json.load(f)
+        report["regressions"] = compare(report, baseline, args.threshold, args.time_floor, args.memory_floor)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f: json.dump(report, f, ensure_ascii=False, indent=2)
+    else: print(json.dumps(report, ensure_ascii=False, indent=2))
+
+    for reg in report.get("regressions", []):
+        print(f"REGRESSION {reg['size']}/{reg['benchmark']} {reg['metric']}: {reg['baseline']:.6g} -> {reg['current']:.6g} ({reg['ratio']:.2f}x adjusted)", file=sys.stderr)
+    return 1 if report.get("regressions") else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
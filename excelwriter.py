@@ -1,6 +1,7 @@
 import os
 import sys
 from openpyxl import load_workbook, Workbook
+from profiler import timed
 
 class ExcelFile:
     def __init__(self, filename):
@@ -26,6 +27,7 @@ class ExcelFile:
             base_path = os.path.dirname(os.path.abspath(__file__))
         return os.path.join(base_path, relative_path)
     
+    @timed("ExcelFile.save", lambda args, kwargs, result: {"bytes_out": os.path.getsize(args[0].file_path)})
     def save(self):
         self.workbook.save(self.file_path)
     
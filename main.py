@@ -2,6 +2,7 @@ import re
 from opendart import get_report, get_dart_report
 from webDataParser import number_value, unpack_zip, search_sections, search_tables, search, lookup_column, lookup_row, lookup_cell
 from config import API_KEY
+import profiler
 
 def parse_date(date_text, format):
     date_text = date_text.strip()
@@ -79,3 +80,4 @@ if __name__ == "__main__":
         display("공모가 범위", price_range)
     
     excel_writer.save()
+    if profiler.ENABLED: profiler.save_summary("profile_summary.json")
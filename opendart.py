@@ -1,29 +1,48 @@
 import os
 import json
 import requests
-from webDataParser import unpack_zip, extract_sections
+from webDataParser import iter_zip_text, extract_sections_stream
 from excelwriter import ExcelFile
+from reportstore import dump_report, load_report, export_json
+from profiler import timed, record_cache
 
 '''
 개별 공시 가져오기
 '''
+@timed("get_dart_report", lambda args, kwargs, result: {"bytes_out": len(result)})
 def get_dart_report(rcept_no: str, api_key: str):
     url = f"https://opendart.fss.or.kr/api/document.xml?crtfc_key={api_key}&rcept_no={rcept_no}"
     response = requests.get(url)
     return response.content
 
+@timed("get_report")
 def get_report(rcept_no: str, api_key: str = ""):
-    filename = f"{rcept_no}.json"
+    '''
+    Load a parsed report from the binary cache ({rcept_no}.dart), downloading it if missing.
+    Older {rcept_no}.json caches are still read and converted. Use export_report_json for a JSON copy.
+    Returns a read-only LazyReport (a Mapping) that decodes a section the first time it is accessed,
+    so search_sections only pays for the sections it matches. Use report.to_dict() for a plain dict.
+    '''
+    filename, json_filename = f"{rcept_no}.dart", f"{rcept_no}.json"
     if os.path.exists(filename):
-        with open(filename, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        record_cache("get_report", True)
+    elif os.path.exists(json_filename):
+        record_cache("get_report", True)
+        with open(json_filename, 'r', encoding='utf-8') as f:
+            dump_report(json.load(f), filename)
     else:
         if not api_key:
             raise ValueError("api_key is required when report file doesn't exist")
-        raw_text = unpack_zip(get_dart_report(rcept_no, api_key))
-        data = extract_sections(raw_text)
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        record_cache("get_report", False)
+        dump_report(extract_sections_stream(iter_zip_text(get_dart_report(rcept_no, api_key))), filename)
+    return load_report(filename, lazy=True)
+
+def export_report_json(rcept_no: str, save_path: str = "", api_key: str = ""):
+    '''
+    Export a parsed report as indented JSON (defaults to {rcept_no}.json).
+    '''
+    data = get_report(rcept_no, api_key)
+    export_json(data, save_path or f"{rcept_no}.json")
     return data
 
 '''
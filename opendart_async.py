@@ -0,0 +1,151 @@
+import os
+import json
+import asyncio
+from contextlib import asynccontextmanager, nullcontext
+import aiohttp
+from webDataParser import iter_zip_text, extract_sections_stream
+from reportstore import dump_report, load_report
+from profiler import timed, record_cache
+
+'''
+asyncio version of opendart.py
+Returns the same data shapes as the sync functions. Downloads are limited by a semaphore
+and CPU-bound parsing runs in an executor so the event loop is never blocked.
+'''
+BASE_URL = "https://opendart.fss.or.kr/api"
+DEFAULT_CONCURRENCY = 10
+
+@asynccontextmanager
+async def _session_scope(session: aiohttp.ClientSession = None):
+    if session is not None:
+        yield session
+        return
+    async with aiohttp.ClientSession() as new_session: yield new_session
+
+async def _get_json(session: aiohttp.ClientSession, url: str, semaphore: asyncio.Semaphore = None):
+    async with semaphore or nullcontext():
+        async with session.get(url) as response: return await response.json(content_type=None)
+
+# Executor jobs are module-level functions taking and returning plain data so they also work in a ProcessPoolExecutor
+def _parse_report(data: bytes, filename: str):
+    data = extract_sections_stream(iter_zip_text(data))
+    dump_report(data, filename)
+    return data
+
+def _load_cached_report(filename: str):
+    return load_report(filename, lazy=False)
+
+def _convert_json_report(json_filename: str, filename: str):
+    with open(json_filename, 'r', encoding='utf-8') as f: data = json.load(f)
+    dump_report(data, filename)
+    return data
+
+'''
+개별 공시 가져오기
+'''
+@timed("async_get_dart_report", lambda args, kwargs, result: {"bytes_out": len(result)})
+async def get_dart_report(rcept_no: str, api_key: str, session: aiohttp.ClientSession = None, semaphore: asyncio.Semaphore = None):
+    url = f"{BASE_URL}/document.xml?crtfc_key={api_key}&rcept_no={rcept_no}"
+    async with _session_scope(session) as session:
+        async with semaphore or nullcontext():
+            async with session.get(url) as response: return await response.read()
+
+@timed("async_get_report")
+async def get_report(rcept_no: str, api_key: str = "", session: aiohttp.ClientSession = None, semaphore: asyncio.Semaphore = None, executor=None):
+    '''
+    Async get_report: same cache files ({rcept_no}.dart, legacy {rcept_no}.json) and contents as the sync version,
+    but returned as a plain dict, fully decoded in the executor (a LazyReport can't leave a worker process).
+    Cache loading and parsing run in `executor`: None for the loop's default thread pool, or any
+    concurrent.futures executor. Jobs are picklable, so a ProcessPoolExecutor works and takes regex parsing off the GIL
+    (profiler stats recorded inside worker processes are not collected).
+    '''
+    loop = asyncio.get_running_loop()
+    filename, json_filename = f"{rcept_no}.dart", f"{rcept_no}.json"
+    if os.path.exists(filename):
+        record_cache("async_get_report", True)
+        return await loop.run_in_executor(executor, _load_cached_report, filename)
+    if os.path.exists(json_filename):
+        record_cache("async_get_report", True)
+        return await loop.run_in_executor(executor, _convert_json_report, json_filename, filename)
+    if not api_key:
+        raise ValueError("api_key is required when report file doesn't exist")
+    record_cache("async_get_report", False)
+    raw = await get_dart_report(rcept_no, api_key, session=session, semaphore=semaphore)
+    return await loop.run_in_executor(executor, _parse_report, raw, filename)
+
+'''
+IPO 관련 공시 가져오기
+'''
+def _list_url(start_date: str, end_date: str, api_key: str, last_reprt_at: str, page_no: int):
+    return f"{BASE_URL}/list.json?crtfc_key={api_key}&bgn_de={start_date}&end_de={end_date}&last_reprt_at={last_reprt_at}&pblntf_ty=C&pblntf_detail_ty=C001&page_no={page_no}&page_count=100"
+
+async def iter_ipo_filings(start_date: str, end_date: str, api_key: str = "", last_reprt_at: str = "N", session: aiohttp.ClientSession = None, concurrency: int = DEFAULT_CONCURRENCY, semaphore: asyncio.Semaphore = None):
+    '''
+    Async iterator over IPO filings (list.json items) between start_date and end_date.
+    Pages after the first are requested concurrently and yielded in page order.
+    Raises ValueError if the first request is invalid.
+    '''
+    semaphore = semaphore or asyncio.Semaphore(concurrency)
+    async with _session_scope(session) as session:
+        first_data = await _get_json(session, _list_url(start_date, end_date, api_key, last_reprt_at, 1), semaphore)
+        if first_data.get("status") != "000": raise ValueError(first_data.get("message", "Unknown error"))
+        for item in first_data.get("list"): yield item
+        pages = [
+            asyncio.ensure_future(_get_json(session, _list_url(start_date, end_date, api_key, last_reprt_at, page_no), semaphore))
+            for page_no in range(2, first_data.get("total_page", 1) + 1)
+        ]
+        try:
+            for page in pages:
+                page_data = await page
+                if page_data.get("status") == "000":
+                    for item in page_data.get("list"): yield item
+        finally:
+            for page in pages: page.cancel()
+
+async def get_all_ipo_reports(start_date: str, end_date: str, api_key: str = "", save_path: str = "", last_reprt_at: str = "N", session: aiohttp.ClientSession = None, concurrency: int = DEFAULT_CONCURRENCY):
+    '''
+    Async get_all_ipo_reports: same return value, pages are fetched concurrently.
+    last_reprt_at: Y for latest reports, N for all reports.
+    '''
+    semaphore = asyncio.Semaphore(concurrency)
+    async with _session_scope(session) as session:
+        first_data = await _get_json(session, _list_url(start_date, end_date, api_key, last_reprt_at, 1), semaphore)
+        if first_data.get("status") != "000": return first_data # when first request is invalid
+
+        all_items = list(first_data.get("list"))
+        pages = await asyncio.gather(*(
+            _get_json(session, _list_url(start_date, end_date, api_key, last_reprt_at, page_no), semaphore)
+            for page_no in range(2, first_data.get("total_page", 1) + 1)
+        ))
+        for page_data in pages:
+            if page_data.get("status") == "000": all_items.extend(page_data.get("list"))
+
+    combined_data = {
+        "status": first_data.get("status"),
+        "total_count": first_data.get("total_count"),
+        "list": all_items
+    }
+
+    if save_path:
+        with open(save_path, 'w', encoding='utf-8') as f: json.dump(combined_data, f, ensure_ascii=False, indent=2)
+    return combined_data
+
+async def iter_ipo_reports(start_date: str, end_date: str, api_key: str = "", last_reprt_at: str = "N", session: aiohttp.ClientSession = None, concurrency: int = DEFAULT_CONCURRENCY, executor=None):
+    '''
+    Async iterator of (filing, report) for every IPO filing between start_date and end_date.
+    Reports are downloaded concurrently (at most `concurrency` at once) and yielded as they finish, not in filing order.
+    Filings repeated in the listing are fetched and yielded once per rcept_no.
+    report is the same structure get_report returns.
+    '''
+    semaphore = asyncio.Semaphore(concurrency)
+    async with _session_scope(session) as session:
+        async def _fetch(item):
+            return item, await get_report(item["rcept_no"], api_key, session=session, semaphore=semaphore, executor=executor)
+
+        tasks = {}
+        async for item in iter_ipo_filings(start_date, end_date, api_key, last_reprt_at, session=session, semaphore=semaphore):
+            if item["rcept_no"] not in tasks: tasks[item["rcept_no"]] = asyncio.ensure_future(_fetch(item))
+        try:
+            for task in asyncio.as_completed(tasks.values()): yield await task
+        finally:
+            for task in tasks.values(): task.cancel()
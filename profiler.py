@@ -0,0 +1,186 @@
+import os
+import json
+import time
+import cProfile
+import pstats
+import inspect
+import threading
+import tracemalloc
+from functools import wraps
+from contextlib import contextmanager
+
+'''
+Stage timing
+Disabled by default; set DART_PROFILE=1 or call enable(). When disabled, a timed function costs one flag check.
+'''
+ENABLED = os.environ.get("DART_PROFILE", "").strip().lower() not in ("", "0", "false", "no", "off")
+
+_stats = {}
+_lock = threading.Lock()
+_local = threading.local()
+
+def enable():
+    global ENABLED
+    ENABLED = True
+
+def disable():
+    global ENABLED
+    ENABLED = False
+
+def reset():
+    with _lock: _stats.clear()
+
+def _entry(stage):
+    entry = _stats.get(stage)
+    if entry is None:
+        entry = _stats[stage] = {"calls": 0, "total": 0.0, "min": None, "max": 0.0, "counters": {}}
+    return entry
+
+def record(stage: str, duration: float, **counters):
+    '''
+    Add one call of `stage` taking `duration` seconds. Extra keyword counters (bytes_in, cells, ...) are summed.
+    '''
+    with _lock:
+        entry = _entry(stage)
+        entry["calls"] += 1
+        entry["total"] += duration
+        entry["min"] = duration if entry["min"] is None else min(entry["min"], duration)
+        entry["max"] = max(entry["max"], duration)
+        for key, value in counters.items():
+            entry["counters"][key] = entry["counters"].get(key, 0) + value
+
+def record_cache(stage: str, hit: bool):
+    '''
+    Count a cache hit or miss for `stage`.
+    '''
+    if not ENABLED: return
+    with _lock:
+        counters = _entry(stage)["counters"]
+        key = "cache_hits" if hit else "cache_misses"
+        counters[key] = counters.get(key, 0) + 1
+
+def timed(stage: str, measure=None):
+    '''
+    Decorator recording the duration of each call under `stage`.
+    measure(args, kwargs, result) may return a dict of counters to add.
+    Recursive calls of the same stage are only timed at the outermost level.
+    Coroutine functions are timed while awaited, without the recursion check (concurrent tasks share a thread).
+    '''
+    def _record(args, kwargs, result, duration):
+        counters = {}
+        if measure:
+            try: counters = measure(args, kwargs, result) or {}
+            except Exception: counters = {}
+        record(stage, duration, **counters)
+
+    def decorator(func):
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                if not ENABLED: return await func(*args, **kwargs)
+                start = time.perf_counter()
+                result = await func(*args, **kwargs)
+                _record(args, kwargs, result, time.perf_counter() - start)
+                return result
+            return async_wrapper
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not ENABLED: return func(*args, **kwargs)
+            active = getattr(_local, "active", None)
+            if active is None: active = _local.active = set()
+            if stage in active: return func(*args, **kwargs)
+            active.add(stage)
+            start = time.perf_counter()
+            try: result = func(*args, **kwargs)
+            finally:
+                duration = time.perf_counter() - start
+                active.discard(stage)
+            _record(args, kwargs, result, duration)
+            return result
+        return wrapper
+    return decorator
+
+def timed_iter(stage: str, iterable, **counters):
+    '''
+    Yield from iterable, recording the time spent producing items (not consuming them) under `stage`
+    once it is exhausted or closed. Adds `chars_out` (total len of the items) to the given counters.
+    Returns iterable unchanged when profiling is disabled.
+    '''
+    if not ENABLED: return iterable
+    def _generator():
+        duration, size = 0.0, 0
+        iterator = iter(iterable)
+        try:
+            while True:
+                start = time.perf_counter()
+                try: item = next(iterator)
+                except StopIteration: break
+                finally: duration += time.perf_counter() - start
+                size += len(item)
+                yield item
+        finally:
+            close = getattr(iterator, "close", None)
+            if close: close()
+            record(stage, duration, chars_out=size, **counters)
+    return _generator()
+
+
+'''
+Summary export
+'''
+def summary():
+    '''
+    Return per-stage statistics as a dict (durations in seconds).
+    '''
+    with _lock:
+        result = {}
+        for stage, entry in _stats.items():
+            item = {
+                "calls": entry["calls"],
+                "total": entry["total"],
+                "mean": entry["total"] / entry["calls"] if entry["calls"] else 0.0,
+                "min": entry["min"] or 0.0,
+                "max": entry["max"],
+            }
+            item.update(entry["counters"])
+            lookups = item.get("cache_hits", 0) + item.get("cache_misses", 0)
+            if lookups: item["cache_hit_rate"] = item.get("cache_hits", 0) / lookups
+            result[stage] = item
+        return result
+
+def save_summary(path: str):
+    with open(path, 'w', encoding='utf-8') as f: json.dump(summary(), f, ensure_ascii=False, indent=2)
+
+
+'''
+Detailed capture for a single report
+'''
+@contextmanager
+def capture(prefix: str, top: int=30):
+    '''
+    Run the block under cProfile and tracemalloc and enable stage timing.
+    Writes `{prefix}.prof` (cProfile stats), `{prefix}_profile.txt` (top functions by cumulative time),
+    `{prefix}_memory.txt` (top allocation sites) and `{prefix}_stages.json` (stage summary).
+    '''
+    was_enabled = ENABLED
+    enable()
+    reset()
+    tracemalloc.start()
+    profile = cProfile.Profile()
+    profile.enable()
+    try: yield
+    finally:
+        profile.disable()
+        snapshot = tracemalloc.take_snapshot()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        if not was_enabled: disable()
+
+        profile.dump_stats(f"{prefix}.prof")
+        with open(f"{prefix}_profile.txt", 'w', encoding='utf-8') as f:
+            pstats.Stats(profile, stream=f).sort_stats("cumulative").print_stats(top)
+        with open(f"{prefix}_memory.txt", 'w', encoding='utf-8') as f:
+            f.write(f"peak: {peak} bytes\n")
+            for stat in snapshot.statistics("lineno")[:top]: f.write(f"{stat}\n")
+        save_summary(f"{prefix}_stages.json")
@@ -0,0 +1,196 @@
+import os
+import json
+import mmap
+import struct
+import marshal
+import tempfile
+from collections.abc import Mapping
+
+'''
+Binary report format
+Stores the {title: {"paragraphs": [[str]], "tables": [[[str]]]}} structure returned by extract_sections.
+
+Layout:
+    header          MAGIC, format version, marshal version, flags, index length (little-endian)
+    section index   marshal of [(title, body offset, body length), ...], offsets relative to the end of the index
+    bodies          one marshal blob per section
+
+Repeated strings within a section are written as the same object, so marshal stores them once and
+references them afterwards. marshal decodes in C, and each body can be read from the memory-mapped file
+on its own. The files are a local cache: marshal data is only loaded from files this module wrote.
+'''
+MAGIC = b'DRPT'
+VERSION = 2
+MARSHAL_VERSION = 4
+FLAG_NONE = 1 # extract_sections returned None
+
+HEADER = struct.Struct('<4sIIIQ')
+
+# read once: os.umask can only be queried by setting it, which is not safe while other threads create files
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def _share_strings(node, strings: dict):
+    if isinstance(node, str): return strings.setdefault(node, node)
+    if isinstance(node, list): return [_share_strings(item, strings) for item in node]
+    if isinstance(node, dict): return {key: _share_strings(value, strings) for key, value in node.items()}
+    return node
+
+
+def dump_report(data: dict | None, path: str):
+    '''
+    Write sections (output of extract_sections) to `path` in the binary format.
+    '''
+    entries, bodies, position = [], [], 0
+    for title, section in (data or {}).items():
+        body = marshal.dumps(_share_strings(section, {}), MARSHAL_VERSION)
+        entries.append((title, position, len(body)))
+        bodies.append(body)
+        position += len(body)
+    index = marshal.dumps(entries, MARSHAL_VERSION)
+
+    flags = FLAG_NONE if data is None else 0
+    # write to a temp file next to `path` and swap it in, so readers never see a partial file
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), prefix=os.path.basename(path), suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, VERSION, MARSHAL_VERSION, flags, len(index)))
+            f.write(index)
+            for body in bodies: f.write(body)
+        os.chmod(tmp_path, 0o666 & ~_UMASK) # mkstemp creates 0600, give the cache the usual permissions
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path): os.remove(tmp_path)
+        raise
+
+
+'''
+Reading
+'''
+class ReportReader:
+    '''
+    Memory-mapped view of a binary report. Sections are decoded one at a time.
+    '''
+    def __init__(self, path: str):
+        with open(path, 'rb') as f:
+            self.buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if f.seek(0, 2) else b''
+        try: self._read_index(path)
+        except Exception:
+            self.close()
+            raise
+
+    def _read_index(self, path: str):
+        size = len(self.buffer)
+        if size < HEADER.size: raise ValueError(f"{path} is not a report file")
+        magic, version, marshal_version, self.flags, index_length = HEADER.unpack_from(self.buffer, 0)
+        if magic != MAGIC: raise ValueError(f"{path} is not a report file")
+        if version != VERSION or marshal_version > marshal.version: raise ValueError(f"unsupported report file version {version}")
+        self.body_start = HEADER.size + index_length
+        if self.body_start > size: raise ValueError(f"{path} is truncated")
+        try: self.index = marshal.loads(self.buffer[HEADER.size:self.body_start])
+        except (EOFError, ValueError, TypeError): raise ValueError(f"{path} has an invalid section index")
+        if any(self.body_start + offset + length > size for _, offset, length in self.index): raise ValueError(f"{path} is truncated")
+        self.titles = [title for title, _, _ in self.index]
+
+    @property
+    def is_none(self):
+        return bool(self.flags & FLAG_NONE)
+
+    def section(self, idx: int):
+        '''
+        Decode the idx-th section into {"paragraphs": ..., "tables": ...}.
+        '''
+        _, offset, length = self.index[idx]
+        start = self.body_start + offset
+        return marshal.loads(self.buffer[start:start + length])
+
+    def close(self):
+        if isinstance(self.buffer, mmap.mmap): self.buffer.close()
+
+
+class LazyReport(Mapping):
+    '''
+    Read-only mapping of sections backed by a ReportReader. A section is decoded the first time it is accessed,
+    so looking up a few sections by name (e.g. with search_sections) never decodes the rest.
+    The file stays memory-mapped until every section is decoded or close() is called.
+    Copying or pickling it gives a plain dict.
+    '''
+    def __init__(self, reader: ReportReader):
+        self._reader = reader
+        self._positions = {title: idx for idx, title in enumerate(reader.titles)}
+        self._sections = {}
+
+    def __getitem__(self, key):
+        section = self._sections.get(key)
+        if section is None:
+            idx = self._positions[key]
+            if self._reader is None: raise ValueError("report is closed")
+            section = self._sections[key] = self._reader.section(idx)
+            if len(self._sections) == len(self._positions): self.close()
+        return section
+
+    def __iter__(self):
+        return iter(self._positions)
+
+    def __len__(self):
+        return len(self._positions)
+
+    def __repr__(self):
+        return f"LazyReport({list(self._positions)})"
+
+    def __reduce__(self):
+        return (dict, (self.to_dict(),))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        '''
+        Release the memory map. Sections decoded so far stay accessible.
+        '''
+        if self._reader is not None:
+            self._reader.close()
+            self._reader = None
+
+    def to_dict(self):
+        '''
+        Decode every remaining section and return a plain dict.
+        '''
+        return {title: self[title] for title in self._positions}
+
+
+def load_report(path: str, lazy: bool=False):
+    '''
+    Load a report written by dump_report as a plain dict, or None if the stored report was None.
+    With lazy=True, returns a LazyReport that decodes sections on access instead.
+    '''
+    reader = ReportReader(path)
+    if reader.is_none:
+        reader.close()
+        return None
+    if lazy: return LazyReport(reader)
+    try: return {title: reader.section(idx) for idx, title in enumerate(reader.titles)}
+    finally: reader.close()
+
+
+def load_section(path: str, title: str):
+    '''
+    Decode a single section by title without decoding the others. Returns None if it doesn't exist.
+    '''
+    reader = ReportReader(path)
+    try:
+        if title not in reader.titles: return None
+        return reader.section(reader.titles.index(title))
+    finally: reader.close()
+
+
+def export_json(data: dict | None, path: str):
+    '''
+    Export a report (dict or LazyReport) as indented JSON.
+    '''
+    if isinstance(data, LazyReport): data = data.to_dict()
+    with open(path, 'w', encoding='utf-8') as f: json.dump(data, f, ensure_ascii=False, indent=2)
@@ -1,6 +1,8 @@
 import re
+import codecs
 import zipfile
 from io import BytesIO
+from profiler import timed, timed_iter
 
 '''
 Regular expressions 
@@ -9,6 +11,39 @@ TABLE_PATTERN = re.compile(r'<TABLE[^>]*>.*?</TABLE>', re.DOTALL | re.IGNORECASE
 ROW_PATTERN = re.compile(r'<TR[^>]*>(.*?)</TR>', re.DOTALL | re.IGNORECASE)
 CELL_PATTERN = re.compile(r'<T[DH][^>]*>(.*?)</T[DH]>', re.DOTALL | re.IGNORECASE)
 CELL_TAG_PATTERN = re.compile(r'<T[DH][^>]*>', re.IGNORECASE)
+TITLE_PATTERN = re.compile(r'<TITLE[^>]*>(.*?)</TITLE>', re.DOTALL | re.IGNORECASE)
+TITLE_START_PATTERN = re.compile(r'<TITLE', re.IGNORECASE)
+
+CHUNK_SIZE = 1 << 16
+
+'''
+Profiling counters
+'''
+def _count_cells(tables):
+    return sum(len(row) for table in tables for row in table)
+
+def _measure_sections(args, kwargs, result):
+    tables = [table for section in (result or {}).values() for table in section["tables"]]
+    return {"chars_in": len(args[0]), "tables": len(tables), "cells": _count_cells(tables)}
+
+def _measure_table(args, kwargs, result):
+    return {"chars_in": len(args[0]), "tables": 1, "cells": _count_cells([result])}
+
+def _measure_unpack(args, kwargs, result):
+    return {"bytes_in": len(args[0]), "chars_out": len(result)}
+
+def _measure_stream_sections(args, kwargs, result):
+    tables = [table for section in (result or {}).values() for table in section["tables"]]
+    return {"tables": len(tables), "cells": _count_cells(tables)}
+
+def _measure_members(args, kwargs, result):
+    return {"bytes_in": len(args[0]) if isinstance(args[0], (bytes, bytearray)) else 0, "members": len(result), "chars_out": sum(len(text) for text in result.values())}
+
+def _measure_matches(args, kwargs, result):
+    return {"matches": len(result)}
+
+def _measure_lookup(args, kwargs, result):
+    return {"cells": _count_cells([args[0]])}
 
 def split_paragraphs(text):
     '''
@@ -40,11 +75,12 @@ def split_texts(text):
     return {"paragraphs": paragraphs, "tables": tables}
 
 
+@timed("extract_sections", _measure_sections)
 def extract_sections(text):
     '''
     Extract sections from text.
     '''
-    matches = list(re.finditer(r'<TITLE[^>]*>(.*?)</TITLE>', text, re.DOTALL | re.IGNORECASE))
+    matches = list(TITLE_PATTERN.finditer(text))
     if not matches: return None
     sections = {}
     for i, match in enumerate(matches):
@@ -55,6 +91,43 @@ def extract_sections(text):
     return sections
 
 
+def iter_sections(chunks):
+    '''
+    Streaming version of extract_sections.
+    Takes an iterable of text chunks and yields (title, section) pairs as soon as the next <TITLE> is seen,
+    so only one section of text is held in memory at a time.
+    '''
+    # body: chunks of the current section known to contain no title
+    # window: unscanned text, starting at the first unmatched <TITLE (or the last few characters)
+    body, window, title = [], '', None
+    for chunk in chunks:
+        window += chunk
+        match = TITLE_PATTERN.search(window)
+        while match:
+            if title: yield title.replace(' ', ''), split_texts((''.join(body) + window[:match.start()]).strip())
+            title = re.sub(r'<[^>]+>', '', match.group(1)).strip()
+            body, window = [], window[match.end():]
+            match = TITLE_PATTERN.search(window)
+        start = TITLE_START_PATTERN.search(window)
+        keep = start.start() if start else max(0, len(window) - len('<TITLE') + 1)
+        if title is not None: body.append(window[:keep]) # text before the first title is never used
+        window = window[keep:]
+    if title: yield title.replace(' ', ''), split_texts((''.join(body) + window).strip())
+
+
+@timed("extract_sections_stream", _measure_stream_sections)
+def extract_sections_stream(chunks):
+    '''
+    Extract sections from an iterable of text chunks. Returns the same structure as extract_sections.
+    Its profiling stage includes the time spent producing the chunks; iter_zip_text also records that part under unpack_zip.
+    '''
+    sections = None
+    for title, section in iter_sections(chunks):
+        if sections is None: sections = {}
+        sections[title] = section
+    return sections
+
+
 def clean_text(text):
     '''
     Clean HTML tags and extra spaces.
@@ -77,18 +150,95 @@ def number_value(obj: str | list, power: int=0, round_digits: int=1, unit: str="
 '''
 Unpack web data to text
 '''
+def detect_encoding(prefix: bytes):
+    '''
+    Detect encoding from the first bytes of a document.
+    Honours a BOM; otherwise UTF-8 if the prefix is valid UTF-8, else cp949 (same rule as before streaming).
+    The XML declaration is ignored because DART documents don't always match it.
+    '''
+    if prefix.startswith(codecs.BOM_UTF8): return 'utf-8-sig'
+    if prefix.startswith(codecs.BOM_UTF16_LE) or prefix.startswith(codecs.BOM_UTF16_BE): return 'utf-16'
+    try: codecs.getincrementaldecoder('utf-8')().decode(prefix, final=False)
+    except UnicodeDecodeError: return 'cp949'
+    return 'utf-8'
+
+
+def _open_zip(data):
+    if isinstance(data, (bytes, bytearray, memoryview)): data = BytesIO(data)
+    return zipfile.ZipFile(data)
+
+
+def decode_stream(stream, chunk_size: int=CHUNK_SIZE):
+    '''
+    Read a binary stream chunk by chunk and yield decoded text chunks.
+    The encoding is detected from the first chunk. If UTF-8 turns out to be invalid in a later chunk
+    (or at the very end), the rest of the stream is decoded as cp949, like unpack_zip's fallback.
+    '''
+    chunk = stream.read(chunk_size)
+    encoding = detect_encoding(chunk)
+    decoder = codecs.getincrementaldecoder(encoding)(errors='strict' if encoding == 'utf-8' else 'ignore')
+    while chunk:
+        pending = decoder.getstate()[0]
+        try: text = decoder.decode(chunk)
+        except UnicodeDecodeError:
+            decoder = codecs.getincrementaldecoder('cp949')(errors='ignore')
+            text = decoder.decode(pending + chunk)
+        if text: yield text
+        chunk = stream.read(chunk_size)
+    pending = decoder.getstate()[0]
+    try: text = decoder.decode(b'', final=True)
+    except UnicodeDecodeError: text = codecs.getincrementaldecoder('cp949')(errors='ignore').decode(pending, final=True) # truncated UTF-8 sequence at the end
+    if text: yield text
+
+
+def zip_members(data):
+    '''
+    Return names of all members in the zip file.
+    '''
+    with _open_zip(data) as zf: return zf.namelist()
+
+
+def iter_zip_text(data, member: str=None, chunk_size: int=CHUNK_SIZE):
+    '''
+    Yield decoded text chunks of one zip member (the first member if `member` is empty).
+    `data` can be bytes, a path or a binary file object.
+    Decompression and decoding time is recorded under the unpack_zip profiling stage.
+    '''
+    bytes_in = len(data) if isinstance(data, (bytes, bytearray, memoryview)) else 0
+    return timed_iter("unpack_zip", _iter_zip_text(data, member, chunk_size), bytes_in=bytes_in)
+
+
+def _iter_zip_text(data, member: str=None, chunk_size: int=CHUNK_SIZE):
+    with _open_zip(data) as zf:
+        with zf.open(member or zf.namelist()[0]) as stream:
+            yield from decode_stream(stream, chunk_size)
+
+
+@timed("unpack_zip_members", _measure_members)
+def unpack_zip_members(data):
+    '''
+    Unpack every member of the zip file. Returns {member name: text}.
+    '''
+    with _open_zip(data) as zf:
+        members = {}
+        for name in zf.namelist():
+            if name.endswith('/'): continue # directory entry
+            with zf.open(name) as stream: members[name] = ''.join(decode_stream(stream))
+        return members
+
+
+@timed("unpack_zip", _measure_unpack)
 def unpack_zip(data):
     '''
-    Unpack zip file to text.
+    Unpack zip file to text (first member only).
     '''
-    with zipfile.ZipFile(BytesIO(data)) as zf: content = zf.read(zf.namelist()[0])
-    try: return content.decode('utf-8')
-    except UnicodeDecodeError: return content.decode('cp949', errors='ignore')
+    return ''.join(_iter_zip_text(data))
 
 
 '''
 Search functions 
 '''
+@timed("search", _measure_matches)
 def search(
     node, parent_node=None, parent_count=0,
     include_keywords: str | list = None, 
@@ -100,6 +250,10 @@ def search(
     2) Return the ancestor `parent_count` levels above the matching node (0 for the matching node itself)
     3) exact: if True, match exactly instead of substring match
     '''
+    return _search(node, parent_node, parent_count, include_keywords, exclude_keywords, exact)
+
+def _search(node, parent_node=None, parent_count=0, include_keywords=None, exclude_keywords=None, exact=False):
+    # undecorated so the recursion doesn't go through the profiling wrapper
     if isinstance(include_keywords, str): include_keywords = [include_keywords]
     if isinstance(exclude_keywords, str): exclude_keywords = [exclude_keywords]
     
@@ -132,7 +286,7 @@ def search(
                 "exclude_keywords": exclude_keywords,
                 "exact": exact,
             }
-            matches.extend(search(value, **kwargs))
+            matches.extend(_search(value, **kwargs))
 
     elif isinstance(node, list): 
         kwargs = {
@@ -142,12 +296,13 @@ def search(
             "exclude_keywords": exclude_keywords,
             "exact": exact,
         }
-        for item in node: matches.extend(search(item, **kwargs))
+        for item in node: matches.extend(_search(item, **kwargs))
     
     elif isinstance(node, str) and _check_match(node): _add_match(node, parents)
     
     return matches
 
+@timed("search_tables", _measure_matches)
 def search_tables(
     sections, parent_count=0,
     include_keywords: str | list = None, 
@@ -170,10 +325,11 @@ def search_tables(
     matches = []
     for section in sections:
         if isinstance(section, dict):
-            for table in section.get("tables", []): matches.extend(search(table, parent_node=section, **kwargs))
-        elif isinstance(section, list): matches.extend(search(section, parent_node=section, **kwargs))
+            for table in section.get("tables", []): matches.extend(_search(table, parent_node=section, **kwargs))
+        elif isinstance(section, list): matches.extend(_search(section, parent_node=section, **kwargs))
     return matches
 
+@timed("search_sections", _measure_matches)
 def search_sections(
     article, 
     include_keywords: str | list = None, 
@@ -198,13 +354,14 @@ def search_sections(
         return True
     
     matches = []
-    for section_name, section_content in article.items():
-        if _check_match(section_name): matches.append(section_content)
+    for section_name in article: # only read matching sections, so a LazyReport decodes nothing else
+        if _check_match(section_name): matches.append(article[section_name])
     return matches
 
 '''
 Excel-like lookup functions
 '''
+@timed("lookup_column", _measure_lookup)
 def lookup_column(table, keys, exact=False):
     '''
     Given a table (list of lists, table[0] is header), 
@@ -231,6 +388,7 @@ def lookup_column(table, keys, exact=False):
 
     return result
 
+@timed("lookup_row", _measure_lookup)
 def lookup_row(table, keys, exact=False):
     '''
     Given a table (list of lists, table[row][0] is header), 
@@ -257,6 +415,7 @@ def lookup_row(table, keys, exact=False):
 
     return result
 
+@timed("lookup_cell", _measure_lookup)
 def lookup_cell(table, row_keys, col_keys, row_exact=False, col_exact=False):
     '''
     Given a table (list of lists, table[row][col] is cell), 
@@ -299,6 +458,7 @@ def lookup_cell(table, row_keys, col_keys, row_exact=False, col_exact=False):
 I dont understand why this works...
 '''
 
+@timed("parse_table", _measure_table)
 def parse_table(html):
     '''
     Get html table and return list of rows. 